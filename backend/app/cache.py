@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from cachetools import TTLCache
+
+_MISSING = object()
+
+
+class SingleFlightTTLCache:
+    """
+    In-process TTL cache for async loaders.
+    Concurrent misses for the same key wait on one lock, so only the first
+    caller hits the upstream service and the rest reuse its result.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        cache_if: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return the cached value for key, calling loader() once on a miss.
+        Results rejected by cache_if (e.g. upstream errors) are returned but not stored."""
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            try:
+                value = await loader()
+                if cache_if(value):
+                    self._cache[key] = value
+                return value
+            finally:
+                # Waiters already hold this lock object; new callers hit the cache or start a fresh load.
+                # A waiter finishing later must not drop a newer caller's lock.
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
@@ -15,5 +15,15 @@ SQLALCHEMY_DATABASE_URL = (
     f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+# Sized for bursts of concurrent requests; recycle connections before server/proxy idle timeouts
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    # Room for every distinct compiled statement the API issues, plus one INSERT batch per import
+    query_cache_size=1200,
+    insertmanyvalues_page_size=1000,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,13 +1,21 @@
 import os
+import asyncio
 import requests
-from typing import List, Optional, Dict, Any
+import httpx
+from typing import List, Optional, Dict, Any, Tuple
 from functools import lru_cache
 from dotenv import load_dotenv
 import base64
+import re
+import logging
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get JIRA credentials from environment variables
 JIRA_URL = os.getenv('JIRA_URL')
 JIRA_USER = os.getenv('JIRA_USER')
@@ -16,6 +24,11 @@ JIRA_TOKEN = os.getenv('JIRA_TOKEN')
 if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
     raise ValueError("Missing required JIRA credentials in environment variables. Please check your .env file.")
 
+# Shared session so sync JIRA calls (including concurrent threadpool requests) reuse keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 def get_jira_headers():
     """Get standardized JIRA headers with authentication"""
     auth_string = f"{JIRA_USER}:{JIRA_TOKEN}"
@@ -65,7 +78,7 @@ def fetch_epic_color(epic_key: str) -> Optional[str]:
     url = f"{JIRA_URL}/rest/api/3/issue/{epic_key}"
     headers = get_jira_headers()
     params = {"fields": "customfield_10011,customfield_10016"}  # customfield_10011: Epic Color, customfield_10016: Epic Name (may vary)
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     if not resp.ok:
         return None
     fields = resp.json().get("fields", {})
@@ -77,7 +90,7 @@ def get_board_id():
     # Get first board (or filter by name/type if needed)
     url = f"{JIRA_URL}/rest/agile/1.0/board"
     headers = get_jira_headers()
-    resp = requests.get(url, headers=headers)
+    resp = _SESSION.get(url, headers=headers)
     boards = resp.json().get("values", [])
     if not boards:
         raise Exception("No JIRA boards found")
@@ -86,7 +99,7 @@ def get_board_id():
 def get_current_and_prior_sprints(board_id):
     url = f"{JIRA_URL}/rest/agile/1.0/board/{board_id}/sprint?state=active,future,closed"
     headers = get_jira_headers()
-    resp = requests.get(url, headers=headers)
+    resp = _SESSION.get(url, headers=headers)
     sprints = resp.json().get("values", [])
     # Find current (active) and most recent closed sprint
     current = next((s for s in sprints if s["state"] == "active"), None)
@@ -95,10 +108,12 @@ def get_current_and_prior_sprints(board_id):
     return current, prior
 
 # JIRA API: Fast search for issues in active sprint - for dropdown autocomplete
-def fetch_jira_issues_for_author(autor: str) -> List[dict]:
+def fetch_jira_issues_for_author(autor: str) -> Tuple[List[dict], dict]:
     """
     Fast fetch of JIRA issues for current sprint only.
-    Returns basic info (key + summary) without parent lookups for speed.
+    Returns (issues, meta): basic info (key + summary) without parent lookups for speed,
+    and the metadata for the endpoint headers. Meta is returned rather than stored on the
+    function, so concurrent fetches for different authors can't read each other's.
     Uses openSprints() JQL function - server-side, fast, includes ALL sprint items.
     Uses /rest/api/3/search/jql endpoint (new API, not deprecated).
     """
@@ -119,7 +134,7 @@ def fetch_jira_issues_for_author(autor: str) -> List[dict]:
     }
     
     try:
-        resp = requests.get(url, headers=headers, params=params)
+        resp = _SESSION.get(url, headers=headers, params=params)
         resp.raise_for_status()
         
         result = resp.json()
@@ -147,8 +162,8 @@ def fetch_jira_issues_for_author(autor: str) -> List[dict]:
         if "TATRAVAG-4075" in issue_keys:
             print(f"[JIRA Fetch] ✓ Benchmark issue TATRAVAG-4075 found!")
         
-        # Set metadata for endpoint headers
-        fetch_jira_issues_for_author.last_meta = {
+        # Metadata for endpoint headers
+        meta = {
             "source": "search_jql",
             "limit": params["maxResults"],
             "requested": params["maxResults"],
@@ -157,15 +172,14 @@ def fetch_jira_issues_for_author(autor: str) -> List[dict]:
             "note": "openSprints() - server-side filtering"
         }
         
-        return issues
+        return issues, meta
         
     except Exception as e:
         print(f"[JIRA Fetch] Failed: {e}")
-        fetch_jira_issues_for_author.last_meta = {
+        return [], {
             "source": "search_jql",
             "note": f"error: {str(e)}"
         }
-        return []
 
 def _fetch_jira_with_issue_picker(autor: str) -> List[dict]:
     """
@@ -190,7 +204,7 @@ def _fetch_jira_with_issue_picker(autor: str) -> List[dict]:
         "showSubTasks": "true"
     }
     
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     
     if resp.status_code == 410:
         raise Exception("Issue picker endpoint is also deprecated")
@@ -291,7 +305,7 @@ def _fetch_issue_details(issue_key: str, headers: dict) -> Optional[Dict[str, An
         "fields": "key,summary,parent,issuelinks,customfield_10020,customfield_10014,customfield_10016"
     }
     
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     
     if not resp.ok:
         return None
@@ -395,7 +409,7 @@ def _fetch_grandparent_info(parent_key: str, headers: dict) -> Optional[Dict[str
         "fields": "key,summary,parent,customfield_10014,customfield_10016"
     }
     
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     if not resp.ok:
         return None
     
@@ -452,7 +466,7 @@ def _fetch_jira_with_new_search_api(autor: str) -> List[dict]:
         "validateQuery": False
     }
     
-    resp = requests.post(url, headers=headers, json=data)
+    resp = _SESSION.post(url, headers=headers, json=data)
     resp.raise_for_status()
     
     result = resp.json()
@@ -481,7 +495,7 @@ def _fetch_jira_with_post_search(autor: str) -> List[dict]:
         "maxResults": 100
     }
     
-    resp = requests.post(url, headers=headers, json=data)
+    resp = _SESSION.post(url, headers=headers, json=data)
     resp.raise_for_status()
     
     result = resp.json()
@@ -497,7 +511,7 @@ def _fetch_jira_via_individual_issues(autor: str) -> List[dict]:
     
     # Get user info first
     params = {"query": autor, "maxResults": 1}
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     resp.raise_for_status()
     
     users = resp.json()
@@ -514,7 +528,7 @@ def _fetch_jira_via_individual_issues(autor: str) -> List[dict]:
         "tempMax": "100"
     }
     
-    resp = requests.get(export_url, headers=headers, params=params)
+    resp = _SESSION.get(export_url, headers=headers, params=params)
     if resp.ok and resp.text:
         return _parse_csv_export(resp.text)
     
@@ -614,7 +628,7 @@ def _fetch_jira_with_graphql(autor: str) -> List[dict]:
         "operationName": "SearchJiraIssues"
     }
     
-    resp = requests.post(url, headers=headers, json=query_data)
+    resp = _SESSION.post(url, headers=headers, json=query_data)
     resp.raise_for_status()
     
     result = resp.json()
@@ -668,7 +682,7 @@ def _fetch_jira_with_gateway_api(autor: str) -> List[dict]:
         "maxResults": 100
     }
     
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     resp.raise_for_status()
     
     result = resp.json()
@@ -680,7 +694,7 @@ def _fetch_jira_recent_issues(autor: str) -> List[dict]:
     headers = get_jira_headers()
     
     # First get user info to confirm authentication
-    resp = requests.get(url, headers=headers)
+    resp = _SESSION.get(url, headers=headers)
     if not resp.ok:
         raise Exception("Cannot authenticate user")
     
@@ -694,7 +708,7 @@ def _fetch_jira_recent_issues(autor: str) -> List[dict]:
         "streams": f"user IS {user_info.get('key', autor)}"
     }
     
-    resp = requests.get(activity_url, headers=headers, params=params)
+    resp = _SESSION.get(activity_url, headers=headers, params=params)
     if resp.ok:
         activities = resp.json()
         return _extract_issues_from_activities(activities)
@@ -739,7 +753,7 @@ def _convert_standard_jira_response(result) -> List[dict]:
         if summary.strip().startswith("Review -") and parent_key:
             # Fetch parent issue to get its parent
             parent_url = f"{JIRA_URL}/rest/api/3/issue/{parent_key}"
-            parent_resp = requests.get(parent_url, headers=get_jira_headers())
+            parent_resp = _SESSION.get(parent_url, headers=get_jira_headers())
             if parent_resp.ok:
                 parent_fields = parent_resp.json().get("fields", {})
                 grandparent = parent_fields.get("parent")
@@ -810,7 +824,7 @@ def _fetch_jira_with_new_api(autor: str) -> List[dict]:
         "jqls": [f"assignee = '{autor}' AND updated >= -30d ORDER BY updated DESC"]
     }
     
-    resp = requests.post(url, headers=headers, json=data)
+    resp = _SESSION.post(url, headers=headers, json=data)
     resp.raise_for_status()
     
     # This API returns different format, need to adapt
@@ -829,7 +843,7 @@ def _fetch_jira_with_jql_endpoint(autor: str) -> List[dict]:
         "context": {}
     }
     
-    resp = requests.post(url, headers=headers, json=data)
+    resp = _SESSION.post(url, headers=headers, json=data)
     resp.raise_for_status()
     
     # This won't work for search, but let's see what happens
@@ -849,14 +863,14 @@ def _fetch_jira_with_picker_api(autor: str) -> List[dict]:
         "showSubTaskParent": True
     }
     
-    resp = requests.get(url, headers=headers, params=params)
+    resp = _SESSION.get(url, headers=headers, params=params)
     if not resp.ok:
         # Try with different parameters if first attempt fails
         params = {
             "query": f"{autor} assignee",
             "maxResults": 50
         }
-        resp = requests.get(url, headers=headers, params=params)
+        resp = _SESSION.get(url, headers=headers, params=params)
     
     resp.raise_for_status()
     
@@ -900,7 +914,7 @@ def _convert_picker_response(result) -> List[dict]:
         if summary.strip().startswith("Review -") and parent_key:
             # Fetch parent issue to get its parent
             parent_url = f"{JIRA_URL}/rest/api/3/issue/{parent_key}"
-            parent_resp = requests.get(parent_url, headers=headers)
+            parent_resp = _SESSION.get(parent_url, headers=headers)
             if parent_resp.ok:
                 parent_fields = parent_resp.json().get("fields", {})
                 grandparent = parent_fields.get("parent")
@@ -951,7 +965,7 @@ def fetch_jira_issue_by_key(issue_key: str) -> Optional[dict]:
     params = {"fields": "key,summary,parent,customfield_10020"}  # customfield_10020: Sprint
     
     try:
-        resp = requests.get(url, headers=headers, params=params)
+        resp = _SESSION.get(url, headers=headers, params=params)
         
         if resp.status_code == 404:
             print(f"JIRA issue {issue_key} not found")
@@ -977,7 +991,7 @@ def fetch_jira_issue_by_key(issue_key: str) -> Optional[dict]:
             print(f"[JIRA Validation] Review issue detected, looking for grandparent")
             # Fetch parent issue to get its parent (grandparent)
             parent_url = f"{JIRA_URL}/rest/api/3/issue/{parent_key}"
-            parent_resp = requests.get(parent_url, headers=headers)
+            parent_resp = _SESSION.get(parent_url, headers=headers)
             if parent_resp.ok:
                 parent_fields = parent_resp.json().get("fields", {})
                 grandparent = parent_fields.get("parent")
@@ -1033,6 +1047,195 @@ def fetch_jira_issue_by_key(issue_key: str) -> Optional[dict]:
         print(f"Error fetching JIRA issue {issue_key}: {str(e)}")
         return None
 
+# Only well-formed keys can go into a `key in (...)` clause - anything else makes JIRA reject the whole JQL
+_JIRA_KEY_RE = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$", re.IGNORECASE)
+
+# Shared async client for JIRA calls made from async endpoints (reuses keep-alive connections).
+# Created on first use and again after app shutdown closed it, so a restarted app in the same process still works.
+_HTTPX: Optional[httpx.AsyncClient] = None
+
+def _async_client() -> httpx.AsyncClient:
+    global _HTTPX
+    if _HTTPX is None or _HTTPX.is_closed:
+        _HTTPX = httpx.AsyncClient(timeout=10, limits=httpx.Limits(max_connections=100))
+    return _HTTPX
+
+async def close_async_client():
+    """Close the shared async JIRA client (called on app shutdown)."""
+    if _HTTPX is not None:
+        await _HTTPX.aclose()
+
+async def jira_get_async(path: str, params: Optional[dict] = None) -> httpx.Response:
+    """GET a JIRA REST path (e.g. /rest/api/3/issue/KEY) on the shared async client."""
+    return await _async_client().get(f"{JIRA_URL}{path}", headers=get_jira_headers(), params=params)
+
+def _batch_search_params(keys: List[str], fields: str) -> dict:
+    return {
+        "jql": f"key in ({','.join(keys)})",
+        "fields": fields,
+        "maxResults": len(keys)
+    }
+
+async def _search_issues_by_keys_async(keys: List[str], fields: str) -> Optional[List[dict]]:
+    """Run one JQL `key in (...)` search on the shared httpx client. Returns raw issues, or None if JIRA rejected the query."""
+    url = f"{JIRA_URL}/rest/api/3/search/jql"
+    resp = await _async_client().get(url, headers=get_jira_headers(), params=_batch_search_params(keys, fields))
+    if not resp.is_success:
+        logger.warning("[JIRA Batch] Search for %s failed: %s", keys, resp.status_code)
+        return None
+    return resp.json().get("issues", [])
+
+def _grandparent_from_parent_fields(parent_fields: dict) -> tuple:
+    """Resolve the uloha (key, summary) of a Review issue from its parent's fields."""
+    grandparent = parent_fields.get("parent")
+    if grandparent:
+        return grandparent.get("key"), grandparent.get("fields", {}).get("summary")
+    epic_link = parent_fields.get('customfield_10014') or parent_fields.get('customfield_10016')
+    if isinstance(epic_link, str):
+        return epic_link, ""
+    if isinstance(epic_link, dict):
+        return epic_link.get('key'), epic_link.get('summary', '')
+    return "NO_EPIC_ASSIGNED", "NO EPIC ASSIGNED"
+
+def _requested_keys(keys: List[str]) -> Dict[str, str]:
+    """Map normalized (upper-case) key -> key as requested by the caller, dropping malformed keys."""
+    requested = {}
+    for key in keys:
+        if key and _JIRA_KEY_RE.match(key.strip()):
+            requested.setdefault(key.strip().upper(), key)
+    return requested
+
+def _parse_batch_issues(raw_issues: List[dict], requested: Dict[str, str]) -> tuple:
+    """
+    Convert raw search results to {requested_key: issue}.
+    Also returns {parent_key: [requested_key, ...]} for Review issues that need their grandparent.
+    """
+    result = {}
+    review_parents = {}
+    for item in raw_issues:
+        original_key = requested.get(item.get("key", "").upper())
+        if not original_key:
+            continue
+        fields = item.get("fields", {})
+        summary = fields.get("summary", "") or ""
+        parent = fields.get("parent")
+        parent_key = parent.get("key") if parent else None
+        parent_summary = parent.get("fields", {}).get("summary") if parent and parent.get("fields") else None
+        result[original_key] = {
+            "key": item.get("key"),
+            "summary": summary,
+            "parent_key": parent_key,
+            "parent_summary": parent_summary
+        }
+        if summary.strip().startswith("Review -") and parent_key:
+            review_parents.setdefault(parent_key, []).append(original_key)
+    return result, review_parents
+
+def _apply_review_grandparents(result: Dict[str, dict], review_parents: Dict[str, List[str]], parent_issues: List[dict]):
+    """Review issues use their grandparent as uloha - replace parent info in place."""
+    parent_fields_by_key = {p.get("key"): p.get("fields", {}) for p in parent_issues}
+    for parent_key, child_keys in review_parents.items():
+        parent_fields = parent_fields_by_key.get(parent_key)
+        if parent_fields is None:
+            grandparent_key, grandparent_summary = "NO_EPIC_ASSIGNED", "NO EPIC ASSIGNED"
+        else:
+            grandparent_key, grandparent_summary = _grandparent_from_parent_fields(parent_fields)
+        for child_key in child_keys:
+            result[child_key]["parent_key"] = grandparent_key
+            result[child_key]["parent_summary"] = grandparent_summary
+
+_REVIEW_PARENT_FIELDS = "parent,customfield_10014,customfield_10016"
+
+# Issue summary/parent info by normalized key. Summaries rarely change within minutes,
+# so repeat entries against the same ticket skip JIRA entirely. Only found issues are cached.
+# Only touched from fetch_jira_issues_by_keys_async on the event loop, so no lock is needed.
+_ISSUE_CACHE = TTLCache(maxsize=2048, ttl=600)
+# Normalized key -> Future of an async lookup in progress (single-flight)
+_ISSUE_INFLIGHT: Dict[str, asyncio.Future] = {}
+
+def _cached_issues(requested: Dict[str, str]) -> tuple:
+    """Split requested keys into ({original_key: cached issue}, {normalized: original} still to fetch)."""
+    hits, misses = {}, {}
+    for norm, original in requested.items():
+        issue = _ISSUE_CACHE.get(norm)
+        if issue is not None:
+            hits[original] = issue
+        else:
+            misses[norm] = original
+    return hits, misses
+
+def _cache_issues(fetched: Dict[str, dict]):
+    for key, issue in fetched.items():
+        _ISSUE_CACHE[key.strip().upper()] = issue
+
+# JIRA API: Look up several issues by key with a single search request
+async def fetch_jira_issues_by_keys_async(keys: List[str]) -> Dict[str, dict]:
+    """
+    Fetch summary and parent info for several JIRA issues at once, from async endpoints.
+    Cached keys are served from memory; the rest go to JIRA in one JQL `key in (...)` search.
+    Review issues get their grandparent as parent, same as fetch_jira_issue_by_key.
+    Concurrent callers asking for the same uncached key wait for one JIRA lookup.
+
+    Returns:
+        Dict mapping each requested key to {key, summary, parent_key, parent_summary}.
+        Keys that were not found are missing from the dict.
+    """
+    result, misses = _cached_issues(_requested_keys(keys))
+
+    waiting = {original: _ISSUE_INFLIGHT[norm] for norm, original in misses.items() if norm in _ISSUE_INFLIGHT}
+    to_fetch = {norm: original for norm, original in misses.items() if norm not in _ISSUE_INFLIGHT}
+
+    if to_fetch:
+        loop = asyncio.get_running_loop()
+        futures = {norm: loop.create_future() for norm in to_fetch}
+        _ISSUE_INFLIGHT.update(futures)
+        fetched = {}
+        try:
+            fetched = await _load_jira_issues_by_keys_async(list(to_fetch.values()))
+            _cache_issues(fetched)
+            result.update(fetched)
+        finally:
+            for norm, future in futures.items():
+                _ISSUE_INFLIGHT.pop(norm, None)
+                if not future.done():
+                    future.set_result(fetched.get(to_fetch[norm]))
+
+    for original, future in waiting.items():
+        # shield: a cancelled waiter must not cancel the lookup other callers share
+        issue = await asyncio.shield(future)
+        if issue:
+            result[original] = issue
+    return result
+
+async def _load_jira_issues_by_keys_async(keys: List[str]) -> Dict[str, dict]:
+    """Uncached body of fetch_jira_issues_by_keys_async."""
+    requested = _requested_keys(keys)
+    if not requested:
+        return {}
+
+    try:
+        raw_issues = await _search_issues_by_keys_async(list(requested), "summary,parent")
+        if raw_issues is None:
+            # JIRA rejects the whole JQL when any key doesn't exist - retry each key on its own, concurrently
+            if len(requested) == 1:
+                return {}
+            result = {}
+            for partial in await asyncio.gather(*(_load_jira_issues_by_keys_async([key]) for key in requested.values())):
+                result.update(partial)
+            return result
+
+        result, review_parents = _parse_batch_issues(raw_issues, requested)
+        if review_parents:
+            parent_issues = await _search_issues_by_keys_async(list(review_parents), _REVIEW_PARENT_FIELDS) or []
+            _apply_review_grandparents(result, review_parents, parent_issues)
+
+        logger.debug("[JIRA Batch] Resolved %d/%d keys in one search", len(result), len(requested))
+        return result
+
+    except Exception as e:
+        logger.warning("[JIRA Batch] Error fetching JIRA issues %s: %s", list(requested.values()), e)
+        return {}
+
 def clean_text(text):
     """Clean up text content by removing excessive whitespace."""
     if not text:
@@ -1251,7 +1454,7 @@ def get_issue_details(issue_key: str):
     }
 
     try:
-        resp = requests.get(url, headers=headers, params=params)
+        resp = _SESSION.get(url, headers=headers, params=params)
         resp.raise_for_status()
         data = resp.json()
         fields = data.get("fields", {})
@@ -1376,7 +1579,7 @@ def fetch_jira_subtasks_for_parent(autor: str, parent_key: str) -> List[dict]:
             "showSubTasks": "true"
         }
         
-        resp = requests.get(url, headers=headers, params=params)
+        resp = _SESSION.get(url, headers=headers, params=params)
         
         if resp.status_code == 410:
             # Fallback to direct API if picker is deprecated
@@ -1431,7 +1634,7 @@ def _fetch_subtasks_direct_api(autor: str, parent_key: str) -> List[dict]:
             "fields": "key,summary,parent,assignee"
         }
         
-        resp = requests.get(url, headers=headers, params=params)
+        resp = _SESSION.get(url, headers=headers, params=params)
         resp.raise_for_status()
         
         result = resp.json()
@@ -1471,7 +1674,7 @@ def debug_jira_issue_visibility(issue_key: str) -> dict:
         # Test 1: Check if issue exists at all
         url = f"{JIRA_URL}/rest/api/3/issue/{issue_key}"
         headers = get_jira_headers()
-        resp = requests.get(url, headers=headers)
+        resp = _SESSION.get(url, headers=headers)
         
         if resp.status_code == 200:
             issue_data = resp.json()
@@ -1517,7 +1720,7 @@ def debug_jira_issue_visibility(issue_key: str) -> dict:
                     "fields": "key,summary"
                 }
                 
-                search_resp = requests.get(search_url, headers=headers, params=params)
+                search_resp = _SESSION.get(search_url, headers=headers, params=params)
                 if search_resp.status_code == 200:
                     search_data = search_resp.json()
                     issues = search_data.get('issues', [])
@@ -1,38 +1,83 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, Body
+from fastapi import FastAPI, Depends, HTTPException, Query, Body, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import RedirectResponse, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import bindparam, func, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import text
 from typing import List, Optional
-from datetime import date, timedelta
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
 import os
+import asyncio
+import hashlib
+import orjson
+import logging
 import httpx
-import json
+import sys
 import time
 
 from . import models, schemas, database
-from .jira import fetch_jira_issues_for_author, fetch_jira_issue_by_key, get_issue_details, fetch_jira_subtasks_for_parent
-from .metaapp_db import MetaAppSession
+from .cache import SingleFlightTTLCache
 
-models.Base.metadata.create_all(bind=database.engine)
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Schema is managed by backend/sql/*.sql; set INIT_DB=1 to create missing tables on startup (local dev)
+if os.getenv("INIT_DB") == "1":
+    models.Base.metadata.create_all(bind=database.engine)
+
+# Pooled OpenAI client and its auth headers, created once in lifespan() - keep-alive
+# connections skip the TCP+TLS handshake on every proxied call
+_OPENAI: Optional[httpx.AsyncClient] = None
+_OPENAI_HEADERS: Optional[dict] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _OPENAI, _OPENAI_HEADERS
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if openai_api_key:
+        _OPENAI_HEADERS = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {openai_api_key}"
+        }
+    _OPENAI = httpx.AsyncClient(
+        base_url="https://api.openai.com",
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+    )
+    try:
+        yield
+    finally:
+        await _OPENAI.aclose()
+        # .jira is imported lazily; only close its client if some endpoint loaded it
+        jira_module = sys.modules.get(f"{__package__}.jira")
+        if jira_module:
+            await jira_module.close_async_client()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Repository root; prompt files and the frontend are resolved against it once at import
+_PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.dirname(__file__)), ".."))
 
 def read_prompt_file(file_path: str, fallback: str) -> str:
     """Read prompt from file, return fallback if file doesn't exist"""
+    if not file_path:
+        return fallback
     try:
-        full_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", file_path)
-        if os.path.exists(full_path):
+        full_path = os.path.join(_PROJECT_ROOT, file_path)
+        if os.path.isfile(full_path):
             with open(full_path, 'r', encoding='utf-8') as f:
                 return f.read().strip()
     except Exception as e:
-        print(f"Could not read prompt file {file_path}: {e}")
+        logger.warning("Could not read prompt file %s: %s", file_path, e)
     return fallback
 
 # Serve static frontend only at /frontend
-frontend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "frontend")
+frontend_path = os.path.join(_PROJECT_ROOT, "frontend")
 app.mount("/frontend", StaticFiles(directory=frontend_path, html=True), name="frontend")
 
 # Redirect root to /frontend/index.html
@@ -40,9 +85,8 @@ app.mount("/frontend", StaticFiles(directory=frontend_path, html=True), name="fr
 def root():
     return RedirectResponse(url="/frontend/index.html")
 
-@app.get("/api/config")
-def get_config():
-    """Get frontend configuration from environment variables"""
+def _build_config() -> dict:
+    """Build frontend configuration from environment variables"""
     # Read prompts from files or fallback to env vars
     whisper_prompt = read_prompt_file(
         os.getenv("WHISPER_PROMPT_FILE", ""), 
@@ -72,13 +116,24 @@ def get_config():
         "defaultAuthor": os.getenv("DEFAULT_AUTHOR", "")
     }
 
-# Enable CORS for frontend
+# Env and prompt files only change on redeploy - build and serialize the config once per process
+_CONFIG_JSON = orjson.dumps(_build_config())
+
+@app.get("/api/config")
+def get_config():
+    """Get frontend configuration from environment variables"""
+    return Response(content=_CONFIG_JSON, media_type="application/json", headers={"Cache-Control": "public, max-age=60"})
+
+# Enable CORS for frontend served from another origin (the bundled /frontend is same-origin).
+# Explicit origins instead of "*" (invalid together with credentials) and a 24h preflight cache.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[o.strip() for o in os.getenv("FRONTEND_ORIGIN", "http://localhost:8003,http://localhost:8000").split(",") if o.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match"],
+    expose_headers=["ETag", "X-Smartclaimer-Next-Before"],
+    max_age=86400,
 )
 
 def get_db():
@@ -88,18 +143,104 @@ def get_db():
     finally:
         db.close()
 
-import time
+def _make_etag(*parts) -> str:
+    return '"' + hashlib.md5(":".join(str(p) for p in parts).encode()).hexdigest() + '"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag in (tag.strip() for tag in if_none_match.split(","))
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def _metaapp_http_error(e: Exception) -> HTTPException:
+    """Map a MetaApp submission failure to an HTTP error (400 for known user/uloha problems)."""
+    error_message = str(e)
+    if "User with login" in error_message:
+        return HTTPException(status_code=400, detail=f"MetaApp Error: {error_message}")
+    elif "No uloha found for epic tag" in error_message:
+        return HTTPException(status_code=400, detail=f"MetaApp Error: {error_message}")
+    else:
+        return HTTPException(status_code=500, detail=f"MetaApp Error: {error_message}")
+
+# Fields of TimeEntryResponse, read straight off a TimeEntry row
+_TIME_ENTRY_RESPONSE_FIELDS = tuple(schemas.TimeEntryResponse.model_fields)
+
+def _entry_response(entry: models.TimeEntry) -> dict:
+    """TimeEntryResponse fields of a row as a plain dict. Endpoints return it in an ORJSONResponse,
+    which bypasses response_model, so the row is serialized without any pydantic pass
+    (same as the list endpoint)."""
+    return {name: getattr(entry, name) for name in _TIME_ENTRY_RESPONSE_FIELDS}
+
+def _check_submittable(db: Session, entries: List[models.TimeEntry]):
+    """Reject rows the time_entry_hodiny_check would refuse to update (legacy rows from before
+    005 keep hodiny > 24) before anything is sent to MetaApp, where the vykaz cannot be undone."""
+    invalid = [entry.id for entry in entries if not 0 <= entry.hodiny <= 24]
+    if invalid:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Hodiny must be between 0 and 24 before submitting (entries {invalid})")
+
+def _save_time_entry(db: Session, db_entry: models.TimeEntry, submit: bool = False) -> dict:
+    """Blocking DB part of the async endpoints - run via run_in_threadpool.
+    Server-side columns come back via RETURNING on flush, so the response is built
+    before commit expires the instance and no refresh SELECT is needed.
+    With submit=True the local row is flushed first, so local failures (constraints, lost
+    connection) surface before the irreversible MetaApp insert; the vykaz id is then
+    written with a second UPDATE in the same transaction."""
+    db.flush()
+    if submit:
+        from .metaapp_db import submit_to_metaapp
+        _check_submittable(db, [db_entry])
+        try:
+            vykaz_id = submit_to_metaapp(db_entry)
+        except Exception as e:
+            db.rollback()
+            raise _metaapp_http_error(e)
+        db_entry.metaapp_vykaz_id = vykaz_id
+        # A bound value (not func.now()) so the flush needs no follow-up SELECT to load it
+        db_entry.submitted_to_metaapp_at = datetime.now(timezone.utc)
+        try:
+            db.flush()
+            response = _entry_response(db_entry)
+            db.commit()
+        except Exception:
+            # MetaApp already has the vykaz - record it so it can be linked or removed by hand
+            logger.error("[MetaApp] vykaz %s created for time entry %s, but saving it locally failed", vykaz_id, db_entry.id)
+            db.rollback()
+            raise
+        return response
+    response = _entry_response(db_entry)
+    db.commit()
+    return response
+
+def get_jira_cache(request: Request) -> dict:
+    """Request-scoped memo of JIRA key -> issue (or None when not found)."""
+    if not hasattr(request.state, "jira_cache"):
+        request.state.jira_cache = {}
+    return request.state.jira_cache
+
+async def _lookup_jira_issues(keys: List[str], cache: dict) -> dict:
+    """Resolve keys through the request cache; only uncached keys go to JIRA, in one batch."""
+    from .jira import fetch_jira_issues_by_keys_async
+    missing = list(dict.fromkeys(k for k in keys if k not in cache))
+    if missing:
+        fetched = await fetch_jira_issues_by_keys_async(missing)
+        for key in missing:
+            cache[key] = fetched.get(key)
+    return {key: cache[key] for key in keys if cache[key]}
 
 @app.post("/time-entries", response_model=schemas.TimeEntryResponse)
-def create_time_entry(entry: schemas.TimeEntryCreate, db: Session = Depends(get_db)):
-    start_time = time.time()
-    print(f"\n[TimeEntry] Starting creation for autor={entry.autor}, jira={entry.jira}, uloha={entry.uloha}")
-    
-    # Validation
-    validation_start = time.time()
-    if entry.hodiny < 0 or not (0 <= entry.minuty <= 59):
-        raise HTTPException(status_code=400, detail="Invalid time values.")
-    print(f"[TimeEntry] Validation took {(time.time() - validation_start)*1000:.1f}ms")
+async def create_time_entry(
+    entry: schemas.TimeEntryCreate,
+    submit: bool = Query(False),
+    db: Session = Depends(get_db),
+    jira_cache: dict = Depends(get_jira_cache),
+):
+    """Create a time entry. With ?submit=true it is also submitted to MetaApp, committed once."""
+    # Stage timings are only computed when DEBUG logging is on
+    timed = logger.isEnabledFor(logging.DEBUG)
+    start_time = time.perf_counter()
+    logger.debug("[TimeEntry] Starting creation for autor=%s, jira=%s, uloha=%s", entry.autor, entry.jira, entry.uloha)
     
     # Initialize metadata
     jira_name = entry.jira_name
@@ -107,41 +248,42 @@ def create_time_entry(entry: schemas.TimeEntryCreate, db: Session = Depends(get_
     
     # Check if we need to fetch JIRA metadata
     if entry.jira or entry.uloha:
-        metadata_start = time.time()
-        metadata_source = "frontend" if jira_name or uloha_name else "backend"
-        print(f"[TimeEntry] Using {metadata_source} metadata")
+        metadata_start = time.perf_counter()
+        logger.debug("[TimeEntry] Using %s metadata", "frontend" if jira_name or uloha_name else "backend")
         
         if not (jira_name and uloha_name):  # Only fetch if we don't have both names
             try:
-                # For JIRA metadata lookup, first try the broader search for specific keys
+                # Resolve both keys with a single batched JIRA search
+                lookup_keys = []
                 if entry.jira and not jira_name:
-                    print(f"[TimeEntry] Looking up JIRA key: {entry.jira}")
-                    jira_lookup_start = time.time()
-                    issue = fetch_jira_issue_by_key(entry.jira)
+                    lookup_keys.append(entry.jira)
+                if entry.uloha and not uloha_name:
+                    lookup_keys.append(entry.uloha)
+                issues = await _lookup_jira_issues(lookup_keys, jira_cache)
+
+                if entry.jira and not jira_name:
+                    issue = issues.get(entry.jira)
                     if issue:
                         jira_name = issue.get('summary', '')
                         uloha_name = issue.get('parent_summary', '') or uloha_name
-                        print(f"[TimeEntry] Found JIRA issue: {entry.jira} -> '{jira_name}' (took {(time.time() - jira_lookup_start)*1000:.1f}ms)")
+                        logger.debug("[TimeEntry] Found JIRA issue: %s -> '%s'", entry.jira, jira_name)
                     else:
-                        print(f"[TimeEntry] JIRA key {entry.jira} not found")
-                
-                # For uloha, also try broader search if still needed
+                        logger.debug("[TimeEntry] JIRA key %s not found", entry.jira)
+
                 if entry.uloha and not uloha_name:
-                    print(f"[TimeEntry] Looking up Uloha key: {entry.uloha}")
-                    uloha_lookup_start = time.time()
-                    parent_issue = fetch_jira_issue_by_key(entry.uloha)
+                    parent_issue = issues.get(entry.uloha)
                     if parent_issue:
                         uloha_name = parent_issue.get('summary', '')
-                        print(f"[TimeEntry] Found Uloha: {entry.uloha} -> '{uloha_name}' (took {(time.time() - uloha_lookup_start)*1000:.1f}ms)")
+                        logger.debug("[TimeEntry] Found Uloha: %s -> '%s'", entry.uloha, uloha_name)
                     else:
-                        print(f"[TimeEntry] Uloha key {entry.uloha} not found")
+                        logger.debug("[TimeEntry] Uloha key %s not found", entry.uloha)
                         
             except Exception as e:
-                print(f"[TimeEntry] Error fetching JIRA data: {str(e)}")
-        print(f"[TimeEntry] Metadata processing took {(time.time() - metadata_start)*1000:.1f}ms")
+                logger.warning("[TimeEntry] Error fetching JIRA data: %s", e)
+        if timed:
+            logger.debug("[TimeEntry] Metadata processing took %.1fms", (time.perf_counter() - metadata_start)*1000)
     # Database operations
-    db_start = time.time()
-    print(f"[TimeEntry] Starting database operations")
+    db_start = time.perf_counter()
     
     db_entry = models.TimeEntry(
         uloha=entry.uloha,
@@ -156,23 +298,74 @@ def create_time_entry(entry: schemas.TimeEntryCreate, db: Session = Depends(get_
     )
     
     db.add(db_entry)
-    commit_start = time.time()
-    db.commit()
-    db.refresh(db_entry)
-    print(f"[TimeEntry] Database commit took {(time.time() - commit_start)*1000:.1f}ms")
-    print(f"[TimeEntry] Total database operations took {(time.time() - db_start)*1000:.1f}ms")
-    
-    total_time = (time.time() - start_time) * 1000
-    print(f"[TimeEntry] Entry creation completed in {total_time:.1f}ms")
+    response = ORJSONResponse(await run_in_threadpool(_save_time_entry, db, db_entry, submit))
+    if timed:
+        finished = time.perf_counter()
+        logger.debug("[TimeEntry] Database operations took %.1fms", (finished - db_start)*1000)
+        logger.debug("[TimeEntry] Entry creation completed in %.1fms", (finished - start_time)*1000)
     
-    return db_entry
+    return response
+
+def bulk_create_time_entries(db: Session, rows: List[dict]) -> List[dict]:
+    """Insert many time entries with one INSERT ... VALUES ... RETURNING per
+    insertmanyvalues page instead of one INSERT per entry, then commit once."""
+    created = db.scalars(insert(models.TimeEntry).returning(models.TimeEntry), rows).all()
+    response = [_entry_response(entry) for entry in created]
+    db.commit()
+    return response
 
-@app.get("/time-entries", response_model=List[schemas.TimeEntryResponse])
+@app.post("/time-entries/bulk", response_model=List[schemas.TimeEntryResponse])
+async def create_time_entries(
+    entries: List[schemas.TimeEntryCreate] = Body(...),
+    db: Session = Depends(get_db),
+    jira_cache: dict = Depends(get_jira_cache),
+):
+    """Create several time entries at once (e.g. a week filled from templates).
+    Missing JIRA names of all entries are resolved with a single batched lookup."""
+    lookup_keys = []
+    for entry in entries:
+        if entry.jira and not entry.jira_name:
+            lookup_keys.append(entry.jira)
+        if entry.uloha and not entry.uloha_name:
+            lookup_keys.append(entry.uloha)
+    issues = {}
+    if lookup_keys:
+        try:
+            issues = await _lookup_jira_issues(lookup_keys, jira_cache)
+        except Exception as e:
+            logger.warning("[TimeEntry] Error fetching JIRA data: %s", e)
+
+    rows = []
+    for entry in entries:
+        row = entry.model_dump()
+        if entry.jira and not entry.jira_name and entry.jira in issues:
+            row["jira_name"] = issues[entry.jira].get('summary', '')
+            row["uloha_name"] = issues[entry.jira].get('parent_summary', '') or row["uloha_name"]
+        if entry.uloha and not row["uloha_name"] and entry.uloha in issues:
+            row["uloha_name"] = issues[entry.uloha].get('summary', '')
+        rows.append(row)
+    if not rows:
+        return []
+    return ORJSONResponse(await run_in_threadpool(bulk_create_time_entries, db, rows))
+
+# Columns returned by the list endpoint, in TimeEntryRow order
+_TIME_ENTRY_ROW_COLUMNS = [models.TimeEntry.__table__.c[name] for name in schemas.TimeEntryRow.model_fields]
+
+@app.get("/time-entries", response_model=List[schemas.TimeEntryRow])
 def list_time_entries(
+    request: Request,
     db: Session = Depends(get_db),
     from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to")
+    to_date: Optional[date] = Query(None, alias="to"),
+    autor: Optional[str] = Query(None),
+    limit: int = Query(200, ge=1, le=500),
+    before: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2},\d+$")
 ):
+    """
+    Time entries newest first, one page at a time.
+    When the page is full, X-Smartclaimer-Next-Before holds the `before` cursor
+    ("datum,id" of the last row) for the next page.
+    """
     if from_date is None or to_date is None:
         # Default to current month and the immediately preceding month when filters are absent
         today = date.today()
@@ -183,12 +376,46 @@ def list_time_entries(
         if to_date is None:
             to_date = today
 
-    query = db.query(models.TimeEntry)
+    time_entry = models.TimeEntry.__table__
+    filters = []
     if from_date:
-        query = query.filter(models.TimeEntry.datum >= from_date)
+        filters.append(time_entry.c.datum >= from_date)
     if to_date:
-        query = query.filter(models.TimeEntry.datum <= to_date)
-    return query.order_by(models.TimeEntry.datum.desc(), models.TimeEntry.id.desc()).all()
+        filters.append(time_entry.c.datum <= to_date)
+    if autor:
+        filters.append(time_entry.c.autor == autor)
+
+    # Cheap version check first: inserts/deletes change count/max id, edits bump modified_at
+    version = db.execute(
+        select(func.count(), func.max(time_entry.c.id), func.max(time_entry.c.modified_at)).where(*filters)
+    ).one()
+    etag = _make_etag(*version, from_date, to_date, autor, limit, before)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    # Keyset pagination: seek past the cursor on the (datum DESC, id DESC) index instead of OFFSET
+    page_filters = list(filters)
+    if before:
+        before_datum, before_id = before.split(",")
+        try:
+            before_datum = date.fromisoformat(before_datum)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid before cursor")
+        page_filters.append(tuple_(time_entry.c.datum, time_entry.c.id) < tuple_(before_datum, int(before_id)))
+
+    # Plain Core rows serialized by orjson - skips ORM instances and per-row Pydantic validation
+    query = (
+        select(*_TIME_ENTRY_ROW_COLUMNS)
+        .where(*page_filters)
+        .order_by(time_entry.c.datum.desc(), time_entry.c.id.desc())
+        .limit(limit)
+    )
+    rows = db.execute(query).mappings().all()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if len(rows) == limit:
+        last = rows[-1]
+        headers["X-Smartclaimer-Next-Before"] = f"{last['datum'].isoformat()},{last['id']}"
+    return ORJSONResponse([dict(row) for row in rows], headers=headers)
 
 @app.delete("/time-entries/{entry_id}")
 def delete_time_entry(entry_id: int, db: Session = Depends(get_db)):
@@ -200,27 +427,38 @@ def delete_time_entry(entry_id: int, db: Session = Depends(get_db)):
     return {"ok": True}
 
 @app.put("/time-entries/{entry_id}", response_model=schemas.TimeEntryResponse)
-def update_time_entry(entry_id: int, entry: schemas.TimeEntryCreate = Body(...), db: Session = Depends(get_db)):
-    db_entry = db.query(models.TimeEntry).filter(models.TimeEntry.id == entry_id).first()
-    if not db_entry:
-        raise HTTPException(status_code=404, detail="Entry not found")
+async def update_time_entry(
+    entry_id: int,
+    entry: schemas.TimeEntryCreate = Body(...),
+    db: Session = Depends(get_db),
+    jira_cache: dict = Depends(get_jira_cache),
+):
     # Try to populate jira_name and uloha_name from JIRA issues if not provided
     jira_name = entry.jira_name
     uloha_name = entry.uloha_name
-    if entry.jira or entry.uloha:
+    if (entry.jira or entry.uloha) and not (jira_name and uloha_name):
         try:
-            issues = fetch_jira_issues_for_author(entry.autor)
-            if entry.jira:
-                issue = next((i for i in issues if i.get('key') == entry.jira), None)
+            lookup_keys = []
+            if entry.jira and not jira_name:
+                lookup_keys.append(entry.jira)
+            if entry.uloha and not uloha_name:
+                lookup_keys.append(entry.uloha)
+            issues = await _lookup_jira_issues(lookup_keys, jira_cache)
+            if entry.jira and not jira_name:
+                issue = issues.get(entry.jira)
                 if issue:
                     jira_name = issue.get('summary', '')
                     uloha_name = issue.get('parent_summary', '') or uloha_name
             if entry.uloha and not uloha_name:
-                parent_issue = next((i for i in issues if i.get('key') == entry.uloha), None)
+                parent_issue = issues.get(entry.uloha)
                 if parent_issue:
                     uloha_name = parent_issue.get('summary', '')
         except Exception:
             pass
+    # Load the row only after the JIRA round-trip, so the pooled connection isn't held idle in transaction meanwhile
+    db_entry = await run_in_threadpool(db.query(models.TimeEntry).filter(models.TimeEntry.id == entry_id).first)
+    if not db_entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
     db_entry.uloha = entry.uloha
     db_entry.datum = entry.datum
     db_entry.hodiny = entry.hodiny
@@ -229,13 +467,11 @@ def update_time_entry(entry_id: int, entry: schemas.TimeEntryCreate = Body(...),
     db_entry.popis = entry.popis
     db_entry.jira_name = jira_name
     db_entry.uloha_name = uloha_name
-    db.commit()
-    db.refresh(db_entry)
-    return db_entry
+    return ORJSONResponse(await run_in_threadpool(_save_time_entry, db, db_entry))
 
 @app.post("/templates", response_model=schemas.TemplateResponse)
 def create_template(template: schemas.TemplateCreate, db: Session = Depends(get_db)):
-    db_template = models.Template(**template.dict())
+    db_template = models.Template(**template.model_dump())
     db.add(db_template)
     db.commit()
     db.refresh(db_template)
@@ -254,31 +490,53 @@ def delete_template(template_id: int, autor: str = Query(...), db: Session = Dep
     db.commit()
     return {"ok": True}
 
+# Per-author cache of the sprint issue list; concurrent misses for one author share a single JIRA call
+_JIRA_ISSUES_CACHE = SingleFlightTTLCache(maxsize=256, ttl=60)
+
+def _load_jira_issues(autor: str) -> dict:
+    """Fetch the author's issues and pre-serialize the response body, headers and ETag."""
+    from .jira import fetch_jira_issues_for_author
+    issues, meta = fetch_jira_issues_for_author(autor)
+    headers = {}
+    if meta.get("source"):
+        headers["X-Smartclaimer-Jira-Source"] = str(meta["source"])
+    if meta.get("limit") is not None:
+        headers["X-Smartclaimer-Jira-Limit"] = str(meta["limit"])
+    if meta.get("requested") is not None:
+        headers["X-Smartclaimer-Jira-Requested"] = str(meta["requested"])
+    if meta.get("returned") is not None:
+        headers["X-Smartclaimer-Jira-Returned"] = str(meta["returned"])
+    if meta.get("reported_total") is not None:
+        headers["X-Smartclaimer-Jira-Total"] = str(meta["reported_total"])
+    if meta.get("note"):
+        headers["X-Smartclaimer-Jira-Note"] = str(meta["note"])
+    body = orjson.dumps(issues)
+    return {
+        "body": body,
+        "headers": headers,
+        "etag": _make_etag(hashlib.md5(body).hexdigest()),
+        "error": str(meta.get("note", "")).startswith("error")
+    }
+
 @app.get("/jira-issues", response_model=List[schemas.JiraIssue])
-def get_jira_issues(autor: str = Query(...)):
+async def get_jira_issues(request: Request, autor: str = Query(...)):
     try:
-        issues = fetch_jira_issues_for_author(autor)
-        meta = getattr(fetch_jira_issues_for_author, "last_meta", {}) or {}
-        headers = {}
-        if meta.get("source"):
-            headers["X-Smartclaimer-Jira-Source"] = str(meta["source"])
-        if meta.get("limit") is not None:
-            headers["X-Smartclaimer-Jira-Limit"] = str(meta["limit"])
-        if meta.get("requested") is not None:
-            headers["X-Smartclaimer-Jira-Requested"] = str(meta["requested"])
-        if meta.get("returned") is not None:
-            headers["X-Smartclaimer-Jira-Returned"] = str(meta["returned"])
-        if meta.get("reported_total") is not None:
-            headers["X-Smartclaimer-Jira-Total"] = str(meta["reported_total"])
-        if meta.get("note"):
-            headers["X-Smartclaimer-Jira-Note"] = str(meta["note"])
-        return JSONResponse(content=issues, headers=headers)
+        cached = await _JIRA_ISSUES_CACHE.get_or_load(
+            autor,
+            lambda: run_in_threadpool(_load_jira_issues, autor),
+            cache_if=lambda value: not value["error"]
+        )
+        headers = {**cached["headers"], "ETag": cached["etag"], "Cache-Control": "private, max-age=30"}
+        if _etag_matches(request, cached["etag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached["body"], media_type="application/json", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"JIRA fetch failed: {e}")
 
 @app.get("/jira-subtasks", response_model=List[schemas.JiraIssue])
 def get_jira_subtasks(autor: str = Query(...), parent_key: str = Query(...)):
     """Get sub-tasks for a specific parent issue, filtered by author"""
+    from .jira import fetch_jira_subtasks_for_parent
     try:
         return fetch_jira_subtasks_for_parent(autor, parent_key)
     except Exception as e:
@@ -287,92 +545,143 @@ def get_jira_subtasks(autor: str = Query(...), parent_key: str = Query(...)):
 @app.get("/api/validate-jira")
 def validate_jira_key(key: str = Query(...)):
     """Validate if a JIRA key exists using broader search"""
+    from .jira import fetch_jira_issue_by_key
     try:
         issue = fetch_jira_issue_by_key(key)
         return {"valid": issue is not None, "issue": issue}
     except Exception as e:
         return {"valid": False, "error": str(e)}
 
+# Module-level statement so SQLAlchemy reuses its compiled form across requests
+_METAAPP_TASKS_SQL = text("""
+SELECT 
+    u.znacky, 
+    u.nazov, 
+    a.login
+FROM metaapp_metaapp_crm.dale_uloha_riesitel r
+    LEFT JOIN metaapp_metaapp_crm.uloha u ON 
+        r.fk3033 = u.id
+    LEFT JOIN metaapp_metaapp_crm.app_user a ON 
+        COALESCE(r.fk3040, r.fk3062) = a.userid
+WHERE r.validto IS NULL
+    AND a.login = :login
+GROUP BY 
+    u.znacky,
+    u.nazov,
+    a.login
+ORDER BY u.znacky
+""")
+
 @app.get("/metaapp-tasks")
-def get_metaapp_tasks(autor: str = Query(...)):
+def get_metaapp_tasks(request: Request, autor: str = Query(...)):
     """Fetch tasks from MetaApp database for a specific user"""
+    from .metaapp_db import MetaAppSession
     try:
         with MetaAppSession() as session:
-            result = session.execute(
-                text("""
-                SELECT 
-                    u.znacky, 
-                    u.nazov, 
-                    a.login
-                FROM metaapp_metaapp_crm.dale_uloha_riesitel r
-                    LEFT JOIN metaapp_metaapp_crm.uloha u ON 
-                        r.fk3033 = u.id
-                    LEFT JOIN metaapp_metaapp_crm.app_user a ON 
-                        COALESCE(r.fk3040, r.fk3062) = a.userid
-                WHERE r.validto IS NULL
-                    AND a.login = :login
-                GROUP BY 
-                    u.znacky,
-                    u.nazov,
-                    a.login
-                ORDER BY u.znacky
-                """),
-                {"login": autor}
-            )
-            
-            tasks = []
-            for row in result:
-                tasks.append({
-                    "code": row[0],  # u.znacky
-                    "summary": row[1],  # u.nazov
-                    "login": row[2]  # a.login
-                })
-            
-            return tasks
+            result = session.execute(_METAAPP_TASKS_SQL, {"login": autor})
+            tasks = [
+                {"code": znacky, "summary": nazov, "login": login}
+                for znacky, nazov, login in result
+            ]
+        # ETag is a hash of the body: the query still runs, an unchanged list only saves the transfer
+        body = orjson.dumps(tasks)
+        etag = _make_etag(hashlib.md5(body).hexdigest())
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"MetaApp fetch failed: {e}")
 
+# Mark a whole batch as submitted in one statement; ids/vykaz ids are passed as two parallel arrays
+_MARK_SUBMITTED_SQL = text("""
+    UPDATE time_entry AS t
+    SET metaapp_vykaz_id = v.vykaz_id,
+        submitted_to_metaapp_at = now(),
+        modified_at = now()
+    FROM unnest(CAST(:ids AS int[]), CAST(:vykaz_ids AS int[])) AS v(id, vykaz_id)
+    WHERE t.id = v.id
+    RETURNING t.id, t.submitted_to_metaapp_at, t.modified_at
+""")
+
+@app.post("/time-entries/submit-to-metaapp", response_model=List[schemas.TimeEntryResponse])
+def submit_time_entries_to_metaapp(ids: List[int] = Body(..., embed=True), db: Session = Depends(get_db)):
+    """Submit several time entries to MetaApp in one batched call (all-or-nothing).
+    Entries locked by a concurrent submit are skipped; already submitted ones are returned as is."""
+    from .metaapp_db import submit_many_to_metaapp
+    entries = (
+        db.query(models.TimeEntry)
+        .filter(models.TimeEntry.id.in_(ids))
+        .order_by(models.TimeEntry.id)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    pending = [entry for entry in entries if not entry.metaapp_vykaz_id]
+    if pending:
+        _check_submittable(db, pending)
+        try:
+            vykaz_ids = submit_many_to_metaapp(pending)
+        except Exception as e:
+            db.rollback()
+            raise _metaapp_http_error(e)
+        try:
+            marked = {
+                row.id: row
+                for row in db.execute(
+                    _MARK_SUBMITTED_SQL,
+                    {"ids": [entry.id for entry in pending], "vykaz_ids": vykaz_ids},
+                )
+            }
+            # Mirror the RETURNING values onto the loaded entries - they stay clean, so no refresh or second UPDATE
+            for entry, vykaz_id in zip(pending, vykaz_ids):
+                row = marked[entry.id]
+                set_committed_value(entry, "metaapp_vykaz_id", vykaz_id)
+                set_committed_value(entry, "submitted_to_metaapp_at", row.submitted_to_metaapp_at)
+                set_committed_value(entry, "modified_at", row.modified_at)
+            response = [_entry_response(entry) for entry in entries]
+            db.commit()
+        except Exception:
+            # MetaApp already has the vykazy - record them so they can be linked or removed by hand
+            logger.error(
+                "[MetaApp] vykazy created but saving them locally failed (time entry -> vykaz): %s",
+                dict(zip((entry.id for entry in pending), vykaz_ids)),
+            )
+            db.rollback()
+            raise
+        return ORJSONResponse(response)
+    response = [_entry_response(entry) for entry in entries]
+    db.commit()
+    return ORJSONResponse(response)
+
 @app.post("/time-entries/{entry_id}/submit-to-metaapp", response_model=schemas.TimeEntryResponse)
 def submit_time_entry_to_metaapp(entry_id: int, db: Session = Depends(get_db)):
     """Submit a time entry to MetaApp database"""
-    from .metaapp_db import submit_to_metaapp
-    
-    # Get the entry
-    entry = db.query(models.TimeEntry).filter(models.TimeEntry.id == entry_id).first()
+    # Row lock held until commit - a concurrent submit of the same entry skips it instead of
+    # submitting to MetaApp a second time
+    entry = (
+        db.query(models.TimeEntry)
+        .filter(models.TimeEntry.id == entry_id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
     if not entry:
+        if db.query(models.TimeEntry.id).filter(models.TimeEntry.id == entry_id).first():
+            raise HTTPException(status_code=409, detail="Entry is already being submitted")
         raise HTTPException(status_code=404, detail="Entry not found")
     
     # Don't resubmit if already submitted
     if entry.metaapp_vykaz_id:
         return entry
-        
-    try:
-        # Submit to MetaApp
-        vykaz_id = submit_to_metaapp(entry)
-        
-        # Update local entry with MetaApp vykaz_id and submission timestamp
-        entry.metaapp_vykaz_id = vykaz_id
-        entry.submitted_to_metaapp_at = func.now()
-        db.commit()
-        db.refresh(entry)
-        return entry
-        
-    except Exception as e:
-        error_message = str(e)
-        if "User with login" in error_message:
-            raise HTTPException(status_code=400, detail=f"MetaApp Error: {error_message}")
-        elif "No uloha found for epic tag" in error_message:
-            raise HTTPException(status_code=400, detail=f"MetaApp Error: {error_message}")
-        else:
-            raise HTTPException(status_code=500, detail=f"MetaApp Error: {error_message}")
+    
+    return ORJSONResponse(_save_time_entry(db, entry, submit=True))
 
 @app.get("/jira-issue-details/{issue_key}")
 async def get_jira_issue_details(issue_key: str):
     """Fetch detailed information about a JIRA issue."""
+    from .jira import get_issue_details
     if not issue_key:
         raise HTTPException(status_code=400, detail="Issue key is required")
     
-    issue_data = get_issue_details(issue_key)
+    issue_data = await asyncio.to_thread(get_issue_details, issue_key)
     if not issue_data:
         raise HTTPException(status_code=404, detail=f"Issue {issue_key} not found or error occurred")
     
@@ -382,34 +691,21 @@ async def get_jira_issue_details(issue_key: str):
 async def openai_chat_proxy(request_data: dict):
     """Proxy endpoint for OpenAI Chat API to handle CORS and API key security."""
     
-    # Get OpenAI API key from environment
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
+    # Headers are built from OPENAI_API_KEY once at startup
+    if not _OPENAI_HEADERS:
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
     
-    # Prepare headers for OpenAI API
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {openai_api_key}"
-    }
-    
     try:
         # Forward request to OpenAI API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=request_data,
-                timeout=30.0
-            )
+        response = await _OPENAI.post("/v1/chat/completions", headers=_OPENAI_HEADERS, json=request_data)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            # Return error details from OpenAI
+            error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {"error": response.text}
+            raise HTTPException(status_code=response.status_code, detail=error_data)
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                # Return error details from OpenAI
-                error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {"error": response.text}
-                raise HTTPException(status_code=response.status_code, detail=error_data)
-                
     except httpx.TimeoutException:
         raise HTTPException(status_code=408, detail="OpenAI API request timed out")
     except httpx.RequestError as e:
@@ -417,67 +713,34 @@ async def openai_chat_proxy(request_data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
 
-@app.get("/api/jira-parent/{issue_key}")
-async def get_jira_issue_parent(issue_key: str):
-    """Fetch parent information for a JIRA issue. For Review issues, returns grandparent."""
-    if not issue_key:
-        raise HTTPException(status_code=400, detail="Issue key is required")
-    
-    from .jira import get_jira_headers, _fetch_issue_details
-    
-    print(f"[API] get_jira_issue_parent called for {issue_key}")
-    
-    try:
-        headers = get_jira_headers()
-        issue_details = _fetch_issue_details(issue_key, headers)
-        
-        if not issue_details:
-            raise HTTPException(status_code=404, detail=f"Issue {issue_key} not found")
-        
-        parent_info = {
-            "parent_key": issue_details.get("parent_key"),
-            "parent_summary": issue_details.get("parent_summary")
-        }
-        
-        print(f"[API] Returning parent info for {issue_key}: {parent_info}")
-        return parent_info
-        
-    except Exception as e:
-        print(f"[API] Error fetching parent for {issue_key}: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching parent: {str(e)}")
-
 @app.get("/api/jira-search-all")
 async def search_all_jira_issues(query: str = Query(...), autor: str = Query(None)):
     """Search ALL issues (optionally filtered by assignee) regardless of sprint/status"""
     if not query:
         return []
     
-    from .jira import get_jira_headers, JIRA_URL
-    import requests
+    from .jira import jira_get_async
     
     if autor:
-        print(f"[API] Searching all issues for {autor} with query: {query}")
+        logger.debug("[API] Searching all issues for %s with query: %s", autor, query)
         # JQL to search issues assigned to specific user
         jql = f'assignee = "{autor}" AND (key ~ "{query}" OR summary ~ "{query}*") ORDER BY updated DESC'
     else:
-        print(f"[API] Searching ALL JIRA issues (no assignee filter) with query: {query}")
+        logger.debug("[API] Searching ALL JIRA issues (no assignee filter) with query: %s", query)
         # JQL to search ALL issues without assignee filter
         jql = f'(key ~ "{query}" OR summary ~ "{query}*") ORDER BY updated DESC'
     
     try:
-        headers = get_jira_headers()
-        
         # Use /search/jql endpoint (not deprecated like /search)
-        url = f"{JIRA_URL}/rest/api/3/search/jql"
         params = {
             "jql": jql,
             "fields": "summary,status,assignee",  # Include assignee for global search
             "maxResults": 50
         }
         
-        resp = requests.get(url, headers=headers, params=params)
-        if not resp.ok:
-            print(f"[JIRA] Search all failed: {resp.status_code} - {resp.text}")
+        resp = await jira_get_async("/rest/api/3/search/jql", params)
+        if not resp.is_success:
+            logger.warning("[JIRA] Search all failed: %s - %s", resp.status_code, resp.text)
             return []
         
         data = resp.json()
@@ -501,27 +764,24 @@ async def search_all_jira_issues(query: str = Query(...), autor: str = Query(Non
                 "assignee_email": assignee_email
             })
         
-        print(f"[JIRA] Found {len(issues)} issues in global search")
+        logger.debug("[JIRA] Found %d issues in global search", len(issues))
         return issues
         
     except Exception as e:
-        print(f"[JIRA] Error in global search: {e}")
+        logger.error("[JIRA] Error in global search: %s", e)
         return []
 
 @app.get("/api/jira-debug/{issue_key}")
 async def get_jira_issue_debug(issue_key: str):
     """Debug endpoint to see raw JIRA data structure."""
-    from .jira import get_jira_headers
-    import requests
+    from .jira import jira_get_async
     
-    headers = get_jira_headers()
-    url = f"{os.getenv('JIRA_URL')}/rest/api/2/issue/{issue_key}"
     params = {
         "fields": "key,summary,parent,customfield_10014,customfield_10016,customfield_10020,issuetype"
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = await jira_get_async(f"/rest/api/2/issue/{issue_key}", params)
         if response.status_code == 200:
             return response.json()
         else:
@@ -532,10 +792,11 @@ async def get_jira_issue_debug(issue_key: str):
 @app.get("/api/jira/{issue_key}")
 async def get_jira_issue_for_ai(issue_key: str):
     """Fetch detailed JIRA issue information for AI assistant."""
+    from .jira import get_issue_details
     if not issue_key:
         raise HTTPException(status_code=400, detail="Issue key is required")
     
-    issue_data = get_issue_details(issue_key)
+    issue_data = await asyncio.to_thread(get_issue_details, issue_key)
     if not issue_data:
         raise HTTPException(status_code=404, detail=f"Issue {issue_key} not found or error occurred")
     
@@ -544,13 +805,12 @@ async def get_jira_issue_for_ai(issue_key: str):
 @app.get("/api/jira-parent/{issue_key}")
 async def get_jira_issue_parent(issue_key: str):
     """Fetch parent information for a specific JIRA issue. If issue starts with 'Review -', returns grandparent."""
-    print(f"[DEBUG] get_jira_issue_parent called for {issue_key}")
     if not issue_key:
         raise HTTPException(status_code=400, detail="Issue key is required")
     
     from .jira import fetch_issue_parent_info
     
-    parent_info = fetch_issue_parent_info(issue_key)
+    parent_info = await asyncio.to_thread(fetch_issue_parent_info, issue_key)
     if not parent_info:
         raise HTTPException(status_code=404, detail=f"Parent information for issue {issue_key} not found")
     
@@ -613,25 +873,22 @@ def test_backlog_sprint_query(autor: str = Query("palko@metaapp.sk")):
         raise HTTPException(status_code=500, detail=f"Test failed: {e}")
 
 @app.get("/api/jira-issue/{issue_key}")
-async def get_jira_issue_details(issue_key: str):
+async def get_jira_issue_by_key(issue_key: str):
     """Fetch any JIRA issue by key (without assignee restrictions) - used for manually entered issues"""
     if not issue_key:
         raise HTTPException(status_code=400, detail="Issue key is required")
     
     try:
-        from .jira import get_jira_headers, JIRA_URL
-        import requests
+        from .jira import jira_get_async
         
         # Fetch issue details without assignee restriction
-        url = f"{JIRA_URL}/rest/api/3/issue/{issue_key}"
-        headers = get_jira_headers()
         params = {"fields": "key,summary,parent,assignee,status,sprint"}
         
-        resp = requests.get(url, headers=headers, params=params)
+        resp = await jira_get_async(f"/rest/api/3/issue/{issue_key}", params)
         
         if resp.status_code == 404:
             raise HTTPException(status_code=404, detail=f"JIRA issue {issue_key} not found")
-        elif not resp.ok:
+        elif not resp.is_success:
             raise HTTPException(status_code=500, detail=f"JIRA API error: {resp.status_code}")
         
         issue_data = resp.json()
@@ -661,128 +918,113 @@ async def get_jira_issue_details(issue_key: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch issue: {e}")
 
+# MetaApp time entries of one author, newest first
+_IMPORT_SQL = text("""
+SELECT
+    v.id AS vykaz_id,
+    u.login AS autor,
+    v.datum,
+    v.hodiny,
+    v.minuty,
+    v.jira,
+    v.poznamka AS popis,
+    ul.znacky AS uloha
+FROM metaapp_metaapp_crm.vykaz v
+    INNER JOIN metaapp_metaapp_crm.dale d ON
+        d.fk3038 = v.id
+        AND d.validto IS NULL
+    INNER JOIN metaapp_metaapp_crm.app_user u ON
+        u.userid = d.fk3040
+        AND u.validto IS NULL
+    LEFT JOIN (
+        metaapp_metaapp_crm.dale d2
+        INNER JOIN metaapp_metaapp_crm.uloha ul ON
+            ul.id = d2.fk3033
+            AND ul.validto IS NULL
+    ) ON
+        d2.fk3038 = v.id
+        AND d2.validto IS NULL
+WHERE u.login = :autor
+    AND v.validto IS NULL
+    AND v.id NOT IN :existing
+ORDER BY v.datum DESC
+LIMIT 100
+""").bindparams(bindparam("existing", expanding=True))
+
 @app.post("/import-from-metaapp")
 def import_from_metaapp(request: dict = Body(...), db: Session = Depends(get_db)):
     """Import time entries from MetaApp database for a specific author."""
+    from .metaapp_db import MetaAppSession
     autor = request.get("autor")
     if not autor:
         raise HTTPException(status_code=400, detail="Autor je povinný")
     
-    start_time = time.time()
-    print(f"[Import] Starting import for author: {autor}")
+    start_time = time.perf_counter()
+    logger.debug("[Import] Starting import for author: %s", autor)
     
     try:
-        # Query MetaApp database
-        query = text("""
-                     
-        SELECT
-            a.id AS vykaz_id,
-            a.login AS autor,
-            a.datum,
-            a.hodiny,
-            a.minuty,
-            a.jira,
-            a.poznamka AS popis,
-            b.znacky AS uloha
-            FROM
-            (
-                SELECT
-                    vykaz.id,
-                    app_user.login,
-                    vykaz.datum,
-                    vykaz.hodiny,
-                    vykaz.minuty,
-                    vykaz.jira,
-                    vykaz.poznamka
-                FROM
-                    metaapp_metaapp_crm.vykaz vykaz
-                    CROSS JOIN metaapp_metaapp_crm.dale dale
-                    CROSS JOIN metaapp_metaapp_crm.app_user app_user
-                WHERE
-                    app_user.userid = dale.fk3040
-                    AND dale.fk3038 = vykaz.id
-                    AND vykaz.validto IS NULL
-                    AND app_user.validto IS NULL
-                    AND dale.validto IS NULL
-            ) a
-            LEFT JOIN (
-                SELECT
-                    uloha.id uloha_id,
-                    uloha.znacky, 
-                    vykaz.id vykaz_id
-                FROM
-                    metaapp_metaapp_crm.vykaz vykaz
-                    CROSS JOIN metaapp_metaapp_crm.dale dale
-                    CROSS JOIN metaapp_metaapp_crm.uloha uloha
-                WHERE
-                    uloha.id = dale.fk3033
-                    AND dale.fk3038 = vykaz.id
-                    AND vykaz.validto IS NULL
-                    AND uloha.validto IS NULL
-                    AND dale.validto IS NULL
-            ) b ON a.id = b.vykaz_id
-            WHERE a.login = :autor
-            ORDER BY datum DESC 
-            LIMIT 100
-        """)
-        print(query)
-        with MetaAppSession() as metaapp_session:
-            result = metaapp_session.execute(query, {"autor": autor})
-            metaapp_entries = result.fetchall()
-        
-        print(f"[Import] Found {len(metaapp_entries)} entries in MetaApp")
-        
-        # Get existing entries with metaapp_vykaz_id to avoid duplicates
-        existing_vykaz_ids = {
-            row[0] for row in db.query(models.TimeEntry.metaapp_vykaz_id)
-            .filter(models.TimeEntry.metaapp_vykaz_id.isnot(None))
-            .filter(models.TimeEntry.autor == autor)
-            .all()
-        }
-        
-        print(f"[Import] Found {len(existing_vykaz_ids)} existing entries with vykaz_id")
-        
+        # Already imported vykaz ids are filtered out in MetaApp, so LIMIT 100 only counts new rows
+        existing_ids = [
+            vykaz_id
+            for (vykaz_id,) in db.query(models.TimeEntry.metaapp_vykaz_id)
+            .filter(
+                models.TimeEntry.autor == autor,
+                models.TimeEntry.metaapp_vykaz_id.isnot(None),
+            )
+            .yield_per(1000)
+        ]
+        logger.debug("[Import] %d entries already imported", len(existing_ids))
+
+        # The (autor, metaapp_vykaz_id) unique index still guards against concurrent imports
+        insert_stmt = (
+            pg_insert(models.TimeEntry)
+            .on_conflict_do_nothing(index_elements=["autor", "metaapp_vykaz_id"])
+            .returning(models.TimeEntry.id)
+        )
+        found_count = 0
         imported_count = 0
-        skipped_count = 0
-        
-        for entry in metaapp_entries:
-            vykaz_id = entry.vykaz_id
-            
-            # Skip if already exists
-            if vykaz_id in existing_vykaz_ids:
-                skipped_count += 1
-                continue
-            
-            # Create new entry
-            new_entry = models.TimeEntry(
-                uloha=entry.uloha or "",
-                autor=entry.autor,
-                datum=entry.datum,
-                hodiny=entry.hodiny or 0,
-                minuty=entry.minuty or 0,
-                jira=entry.jira,
-                popis=entry.popis,
-                metaapp_vykaz_id=vykaz_id
+        with MetaAppSession() as metaapp_session:
+            # Server-side cursor: insert each fetched batch before pulling the next one
+            result = metaapp_session.execute(
+                _IMPORT_SQL,
+                {"autor": autor, "existing": existing_ids},
+                execution_options={"stream_results": True},
             )
-            
-            db.add(new_entry)
-            imported_count += 1
-        
-        # Commit all new entries
-        if imported_count > 0:
+            for partition in result.partitions(200):
+                rows = [
+                    {
+                        "uloha": entry.uloha or "",
+                        "autor": entry.autor,
+                        "datum": entry.datum,
+                        "hodiny": entry.hodiny or 0,
+                        "minuty": entry.minuty or 0,
+                        "jira": entry.jira,
+                        "popis": entry.popis,
+                        "metaapp_vykaz_id": entry.vykaz_id
+                    }
+                    for entry in partition
+                ]
+                found_count += len(rows)
+                imported_count += len(db.execute(insert_stmt, rows).all())
+
+        if imported_count:
             db.commit()
-            print(f"[Import] Committed {imported_count} new entries")
+        logger.debug("[Import] Found %d entries in MetaApp, committed %d new", found_count, imported_count)
+        # Rows dropped by ON CONFLICT (imported concurrently); earlier imports are not counted
+        skipped_count = found_count - imported_count
         
-        total_time = (time.time() - start_time) * 1000
-        print(f"[Import] Import completed in {total_time:.1f}ms")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[Import] Import completed in %.1fms", (time.perf_counter() - start_time) * 1000)
         
         return {
             "imported_count": imported_count,
             "skipped_count": skipped_count,
-            "total_found": len(metaapp_entries)
+            # Entries of this author that were already in the app (imported or submitted earlier)
+            "already_imported_count": len(existing_ids),
+            "total_found": found_count
         }
         
     except Exception as e:
-        print(f"[Import] Error during import: {str(e)}")
+        logger.error("[Import] Error during import: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Chyba pri importe: {str(e)}")
@@ -1,36 +1,137 @@
+import csv
+import io
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import URL, create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import text
 
-from urllib.parse import quote_plus
-
-METAAPP_DB_URL = (
-    f"postgresql+psycopg2://{os.getenv('METAAPP_DB_USER')}:{quote_plus(os.getenv('METAAPP_DB_PASSWORD'))}"
-    f"@{os.getenv('METAAPP_DB_HOST')}:{os.getenv('METAAPP_DB_PORT')}/{os.getenv('METAAPP_DB_NAME')}"
+# URL.create takes the password as is - no manual quoting of special characters
+METAAPP_DB_URL = URL.create(
+    drivername="postgresql+psycopg2",
+    username=os.getenv("METAAPP_DB_USER"),
+    password=os.getenv("METAAPP_DB_PASSWORD"),
+    host=os.getenv("METAAPP_DB_HOST"),
+    port=int(os.getenv("METAAPP_DB_PORT", "5432")),
+    database=os.getenv("METAAPP_DB_NAME"),
+    # application_name shows up in pg_stat_activity on the MetaApp side
+    query={"application_name": "smart-claimer", "sslmode": os.getenv("METAAPP_DB_SSLMODE", "prefer")},
 )
 
-engine = create_engine(METAAPP_DB_URL, pool_pre_ping=True)
+# Pooled so per-request sessions reuse connections instead of reconnecting to MetaApp.
+# Sized for the threadpool of concurrent sync endpoints; recycled before proxy/PgBouncer idle timeouts.
+engine = create_engine(
+    METAAPP_DB_URL,
+    pool_size=25,
+    max_overflow=25,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    # A stuck MetaApp query fails after 30s instead of pinning a pooled connection and a worker thread
+    connect_args={"options": "-c statement_timeout=30000"},
+    query_cache_size=500,
+    # executemany() goes through psycopg2's execute_values/execute_batch, ~500 rows per round-trip
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=500,
+    executemany_batch_page_size=500,
+)
 MetaAppSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Plain DB-API statement: the single submit runs on a raw psycopg2 cursor
+_INSERT_VYKAZ = "SELECT metaapp_metaapp_crm.insert_vykaz_entry(%s, %s, %s, %s, %s, %s, %s)"
+
+# Module-level statement so SQLAlchemy reuses its compiled form across calls
+_INSERT_VYKAZ_MANY = text(
+    "SELECT metaapp_metaapp_crm.insert_vykaz_entry(t.login, t.epic_tag, t.jira, t.datum, t.hodiny, t.minuty, t.poznamka) "
+    "FROM unnest("
+    "CAST(:login AS text[]), CAST(:epic_tag AS text[]), CAST(:jira AS text[]), CAST(:datum AS date[]), "
+    "CAST(:hodiny AS int[]), CAST(:minuty AS int[]), CAST(:poznamka AS text[])"
+    ") WITH ORDINALITY AS t(login, epic_tag, jira, datum, hodiny, minuty, poznamka, n) "
+    "ORDER BY t.n"
+)
+
+# Above this many entries the values are streamed with COPY instead of bound as arrays
+_COPY_THRESHOLD = 500
+
+def _vykaz_params(entry) -> tuple:
+    return (entry.autor, entry.uloha, entry.jira, entry.datum, entry.hodiny, entry.minuty, entry.popis or "")
+
 def submit_to_metaapp(entry) -> int:
     """
     Submit a time entry to MetaApp database.
     Returns the vykaz_id if successful, raises an exception if failed.
     """
-    with MetaAppSession() as session:
-        result = session.execute(
-            text("SELECT metaapp_metaapp_crm.insert_vykaz_entry(:login, :epic_tag, :jira, :datum, :hodiny, :minuty, :poznamka)"),
+    # One scalar on the hot submit path - read it straight off the DB-API cursor, no Result/Row wrapping
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.execute(_INSERT_VYKAZ, _vykaz_params(entry))
+            vykaz_id = cur.fetchone()[0]
+        raw.commit()
+        return vykaz_id
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+def submit_many_to_metaapp(entries) -> list:
+    """
+    Submit several time entries to MetaApp in one round-trip and one commit.
+    The columns are sent as arrays and unnested server-side, so N entries cost one
+    statement instead of N. All-or-nothing: if any entry is rejected, none are inserted.
+    Returns the vykaz_ids in the same order as entries.
+    """
+    if not entries:
+        return []
+    if len(entries) > _COPY_THRESHOLD:
+        return bulk_import_time_entries(_vykaz_params(entry) for entry in entries)
+    with engine.begin() as conn:
+        return conn.execute(
+            _INSERT_VYKAZ_MANY,
             {
-                "login": entry.autor,
-                "epic_tag": entry.uloha,
-                "jira": entry.jira,
-                "datum": entry.datum,
-                "hodiny": entry.hodiny,
-                "minuty": entry.minuty,
-                "poznamka": entry.popis or ""
+                "login": [entry.autor for entry in entries],
+                "epic_tag": [entry.uloha for entry in entries],
+                "jira": [entry.jira for entry in entries],
+                "datum": [entry.datum for entry in entries],
+                "hodiny": [entry.hodiny for entry in entries],
+                "minuty": [entry.minuty for entry in entries],
+                "poznamka": [entry.popis or "" for entry in entries]
             }
-        )
-        vykaz_id = result.scalar()
-        session.commit()
-        return vykaz_id
+        ).scalars().all()
+
+def bulk_import_time_entries(rows) -> list:
+    """
+    Back-fill many entries into MetaApp: rows of (login, epic_tag, jira, datum, hodiny, minuty, poznamka)
+    are streamed with COPY into a temp staging table, then inserted with one
+    insert_vykaz_entry(...) call per staged row in a single statement.
+    All-or-nothing; returns the vykaz_ids in input order.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.execute(
+                "CREATE TEMP TABLE staging_vykaz ("
+                "n serial, login text, epic_tag text, jira text, datum date, hodiny int, minuty int, poznamka text"
+                ") ON COMMIT DROP"
+            )
+            # Empty CSV fields are NULL (jira); FORCE_NOT_NULL keeps an empty poznamka as ''
+            cur.copy_expert(
+                "COPY staging_vykaz (login, epic_tag, jira, datum, hodiny, minuty, poznamka) "
+                "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (poznamka))",
+                buffer
+            )
+            cur.execute(
+                "SELECT metaapp_metaapp_crm.insert_vykaz_entry(login, epic_tag, jira, datum, hodiny, minuty, poznamka) "
+                "FROM staging_vykaz ORDER BY n"
+            )
+            vykaz_ids = [row[0] for row in cur.fetchall()]
+        raw.commit()
+        return vykaz_ids
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
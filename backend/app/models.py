@@ -1,32 +1,50 @@
-from sqlalchemy import Column, Integer, String, Date, Text, TIMESTAMP, func
-from sqlalchemy.ext.declarative import declarative_base
+from datetime import date, datetime
+from typing import Optional
 
-Base = declarative_base()
+from sqlalchemy import Integer, String, Date, Text, TIMESTAMP, CheckConstraint, Index, func, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+class Base(DeclarativeBase):
+    pass
 
 class TimeEntry(Base):
     __tablename__ = "time_entry"
-    id = Column(Integer, primary_key=True, index=True)
-    uloha = Column(Text, nullable=False)
-    autor = Column(String, nullable=False)
-    datum = Column(Date, nullable=False)
-    hodiny = Column(Integer, nullable=False)
-    minuty = Column(Integer, nullable=False)
-    jira = Column(String, nullable=True)
-    popis = Column(Text, nullable=True)
-    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
-    modified_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
-    submitted_to_metaapp_at = Column(TIMESTAMP(timezone=True), nullable=True)
-    jira_name = Column(Text, nullable=True)
-    uloha_name = Column(Text, nullable=True)
-    metaapp_vykaz_id = Column(Integer, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    uloha: Mapped[str] = mapped_column(Text)
+    autor: Mapped[str] = mapped_column(String)
+    datum: Mapped[date] = mapped_column(Date)
+    hodiny: Mapped[int] = mapped_column(Integer)
+    minuty: Mapped[int] = mapped_column(Integer)
+    jira: Mapped[Optional[str]] = mapped_column(String)
+    popis: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    modified_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now())
+    submitted_to_metaapp_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
+    jira_name: Mapped[Optional[str]] = mapped_column(Text)
+    uloha_name: Mapped[Optional[str]] = mapped_column(Text)
+    metaapp_vykaz_id: Mapped[Optional[int]] = mapped_column(Integer)
+
+    __table_args__ = (
+        CheckConstraint("hodiny BETWEEN 0 AND 24", name="time_entry_hodiny_check"),
+        CheckConstraint("minuty BETWEEN 0 AND 59", name="time_entry_minuty_check"),
+        Index("ux_time_entry_autor_vykaz", "autor", "metaapp_vykaz_id", unique=True),
+        Index("ix_time_entry_datum_id", text("datum DESC"), text("id DESC")),
+        Index("ix_time_entry_autor_datum_id", "autor", text("datum DESC"), text("id DESC")),
+    )
+    # Fetch id/created_at/modified_at via RETURNING on flush instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
 class Template(Base):
     __tablename__ = "template"
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
-    uloha = Column(Text, nullable=True)
-    autor = Column(String, nullable=False)
-    hodiny = Column(String, nullable=True)
-    minuty = Column(String, nullable=True)
-    jira = Column(String, nullable=True)
-    popis = Column(Text, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String)
+    uloha: Mapped[Optional[str]] = mapped_column(Text)
+    autor: Mapped[str] = mapped_column(String)
+    hodiny: Mapped[Optional[str]] = mapped_column(String)
+    minuty: Mapped[Optional[str]] = mapped_column(String)
+    jira: Mapped[Optional[str]] = mapped_column(String)
+    popis: Mapped[Optional[str]] = mapped_column(Text)
+
+    __table_args__ = (
+        Index("ix_template_autor", "autor"),
+    )
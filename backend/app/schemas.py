@@ -1,11 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import date, datetime
 
 class TimeEntryCreate(BaseModel):
     uloha: str
     datum: date
-    hodiny: int = Field(..., ge=0)
+    hodiny: int = Field(..., ge=0, le=24)
     minuty: int = Field(..., ge=0, le=59)
     jira: Optional[str] = None
     popis: Optional[str] = None
@@ -14,6 +14,10 @@ class TimeEntryCreate(BaseModel):
     uloha_name: Optional[str] = None
 
 class TimeEntryResponse(TimeEntryCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    # Stored rows from before the 0-24 check may exceed it; responses show them as they are
+    hodiny: int
     id: int
     autor: str
     created_at: datetime
@@ -23,8 +27,22 @@ class TimeEntryResponse(TimeEntryCreate):
     uloha_name: Optional[str] = None
     metaapp_vykaz_id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+class TimeEntryRow(BaseModel):
+    """Row of the time entry list - only the columns the frontend list renders and edits."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    uloha: str
+    uloha_name: Optional[str] = None
+    autor: str
+    datum: date
+    hodiny: int
+    minuty: int
+    jira: Optional[str] = None
+    jira_name: Optional[str] = None
+    popis: Optional[str] = None
+    created_at: datetime
+    metaapp_vykaz_id: Optional[int] = None
 
 class TemplateBase(BaseModel):
     name: str
@@ -39,11 +57,14 @@ class TemplateCreate(TemplateBase):
     pass
 
 class TemplateResponse(TemplateBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
-    class Config:
-        orm_mode = True
 
 class JiraIssue(BaseModel):
+    # Immutable and hashable, so cached instances are safe to share between requests
+    model_config = ConfigDict(frozen=True)
+
     key: str
     summary: Optional[str] = None
     parent_key: Optional[str] = None
@@ -14,3 +14,14 @@ CREATE TABLE IF NOT EXISTS time_entry (
     uloha_name TEXT,
     metaapp_vykaz_id INTEGER
 );
+
+CREATE TABLE IF NOT EXISTS template (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    uloha TEXT,
+    autor VARCHAR NOT NULL,
+    hodiny VARCHAR,
+    minuty VARCHAR,
+    jira VARCHAR,
+    popis TEXT
+);
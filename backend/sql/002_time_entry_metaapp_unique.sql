@@ -0,0 +1,2 @@
+-- One local row per imported MetaApp vykaz; lets import_from_metaapp dedup with ON CONFLICT DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS ux_time_entry_autor_vykaz ON time_entry (autor, metaapp_vykaz_id);
@@ -0,0 +1,2 @@
+-- Matches ORDER BY datum DESC, id DESC in list_time_entries so paging reads the index instead of sorting
+CREATE INDEX IF NOT EXISTS ix_time_entry_datum_id ON time_entry (datum DESC, id DESC);
@@ -0,0 +1,3 @@
+-- Per-author time entry list (WHERE autor = ? ORDER BY datum DESC, id DESC) and per-author templates
+CREATE INDEX IF NOT EXISTS ix_time_entry_autor_datum_id ON time_entry (autor, datum DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_template_autor ON template (autor);
@@ -0,0 +1,3 @@
+-- At most one day per entry; NOT VALID checks new and updated rows without rescanning existing ones
+ALTER TABLE time_entry DROP CONSTRAINT IF EXISTS time_entry_hodiny_check;
+ALTER TABLE time_entry ADD CONSTRAINT time_entry_hodiny_check CHECK (hodiny BETWEEN 0 AND 24) NOT VALID;
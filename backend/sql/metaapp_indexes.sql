@@ -0,0 +1,9 @@
+-- Recommended indexes for the MetaApp database (NOT the local time_entry DB).
+-- Not applied automatically; run by the MetaApp DBA. They back the joins in
+-- import_from_metaapp: user by login -> vykaz links by user -> uloha link by vykaz.
+CREATE INDEX IF NOT EXISTS ix_app_user_login_current
+    ON metaapp_metaapp_crm.app_user (login) WHERE validto IS NULL;
+CREATE INDEX IF NOT EXISTS ix_dale_fk3040_current
+    ON metaapp_metaapp_crm.dale (fk3040) WHERE validto IS NULL;
+CREATE INDEX IF NOT EXISTS ix_dale_fk3038_current
+    ON metaapp_metaapp_crm.dale (fk3038) WHERE validto IS NULL;
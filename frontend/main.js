@@ -283,16 +283,25 @@ function attachSearchBarEvents() {
     });
 }
 
+const ENTRIES_PAGE_SIZE = 500;
+
 async function loadEntries() {
     entriesList.innerHTML = '<div class="text-center text-muted py-4">Načítavam...</div>';
     try {
-        let url = '/time-entries';
+        const params = new URLSearchParams({ limit: ENTRIES_PAGE_SIZE });
         if (!showAllEntries) {
-            url += `?autor=${encodeURIComponent(form.autor.value.trim())}`;
+            params.set('autor', form.autor.value.trim());
+        }
+        // The API is paginated - follow the keyset cursor until the last page
+        const data = [];
+        while (true) {
+            const resp = await fetch(`/time-entries?${params}`);
+            if (!resp.ok) throw new Error('Chyba načítania');
+            data.push(...await resp.json());
+            const nextBefore = resp.headers.get('X-Smartclaimer-Next-Before');
+            if (!nextBefore) break;
+            params.set('before', nextBefore);
         }
-        const resp = await fetch(url);
-        if (!resp.ok) throw new Error('Chyba načítania');
-        const data = await resp.json();
         allEntries = data;
         // --- Filter by author on frontend as well, for safety ---
         let entriesToRender = allEntries;
@@ -837,7 +846,8 @@ document.getElementById('importFromMetaAppBtn').addEventListener('click', async
             throw new Error(result.detail || 'Chyba pri importe');
         }
 
-        showAlert(`Import dokončený. Importované: ${result.imported_count} záznamov, Preskočené: ${result.skipped_count} záznamov.`, 'success');
+        const skipped = (result.already_imported_count || 0) + (result.skipped_count || 0);
+        showAlert(`Import dokončený. Importované: ${result.imported_count} záznamov, Už importované skôr: ${skipped} záznamov.`, 'success');
         
         // Refresh the entries list
         await loadEntriesWithScrollPreservation();